@@ -0,0 +1,44 @@
+import hmac
+import streamlit as st
+import metrics
+from config import METRICS_ADMIN_TOKEN, RSS_FEED_OPTIONS
+
+# Operator page, reached with ?admin=metrics&token=... once METRICS_ADMIN_TOKEN is set; without a token it stays off.
+# Shows this process's counters and timing percentiles; each server process keeps its own.
+
+def requested():
+    return st.query_params.get("admin") == "metrics"
+
+def authorized():
+    if not METRICS_ADMIN_TOKEN:
+        return False
+    # compare_digest only takes ASCII str, so a token like "é" would raise instead of failing the check
+    return hmac.compare_digest(st.query_params.get("token", "").encode("utf-8"), METRICS_ADMIN_TOKEN.encode("utf-8"))
+
+def render_metrics_page(feed_cache):
+    st.title("TC2 Hub Metrics")
+    if not METRICS_ADMIN_TOKEN:
+        st.error("The metrics page is off. Set METRICS_ADMIN_TOKEN in secrets to turn it on.")
+        return
+    if not authorized():
+        st.error("Missing or wrong token.")
+        return
+    st.button("Refresh")  # any click reruns the page with current numbers
+    counters, timings = metrics.snapshot()
+    st.subheader("Timings (seconds)")
+    if timings:
+        st.dataframe(timings)
+    else:
+        st.info("Nothing timed yet.")
+    st.subheader("Counters")
+    if counters:
+        st.dataframe(counters)
+    else:
+        st.info("Nothing counted yet.")
+    st.subheader("Feeds")
+    feed_names = {url: name for name, url in RSS_FEED_OPTIONS.items()}
+    feed_rows = [{"feed": feed_names.get(url, url), **counts} for url, counts in feed_cache.stats().items()]
+    if feed_rows:
+        st.dataframe(feed_rows)
+    else:
+        st.info("No feeds loaded yet.")
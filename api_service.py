@@ -0,0 +1,160 @@
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import threading
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+import metrics
+from careeronestop import CareerOneStopError, record_count, search_certifications
+from catalog import catalog_version, load_catalog
+from config import FEED_CACHE_DIR, FEED_REFRESH_SECONDS, JOBS_PER_PAGE, METRICS_WINDOW, RSS_FEED_OPTIONS
+from feed_cache import FeedCache, get_feed_cache
+from job_store import get_job_store
+from search_index import get_search_index
+from warmup import warm_up_configured
+
+# Headless JSON API over the same catalog, search and job feed data as streamlit_app.py.
+# Caches live in shared files (CareerOneStop responses, feed snapshots, job store). Workers only read the
+# feed snapshots and job store; main() runs the one process that refreshes feeds and writes postings.
+
+
+def _encode(payload): #(body, etag) for a JSON payload
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _respond(request, body, etag, status_code=200):
+    if status_code == 200 and etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, status_code=status_code, media_type="application/json", headers={"ETag": etag})
+
+
+def json_response(request, payload, status_code=200):
+    body, etag = _encode(payload)
+    return _respond(request, body, etag, status_code)
+
+
+def error_response(request, status_code, message):
+    return json_response(request, {"error": message}, status_code=status_code)
+
+
+@functools.lru_cache(maxsize=1024)
+def _certifications_body(major, version): #Serialized once per (major, catalog version)
+    catalog = load_catalog()
+    certifications = [{**catalog["certifications"][cert_id], "id": cert_id, "name": display_name}
+                      for display_name, cert_id in catalog["majors"][major]]
+    return _encode({"major": major, "catalog_version": version, "certifications": certifications})
+
+
+async def major_certifications(request):
+    major = request.path_params["major"]
+    if major not in load_catalog()["majors"]:
+        return error_response(request, 404, f"Unknown major: {major}")
+    return _respond(request, *_certifications_body(major, catalog_version()))
+
+
+async def search(request):
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return error_response(request, 400, "Missing query parameter 'q'")
+    try:
+        page = max(1, int(request.query_params.get("page", "1")))
+    except ValueError:
+        return error_response(request, 400, "'page' must be an integer")
+    # The index lock is shared with listeners adding API results, so searching happens off the event loop
+    results = await run_in_threadpool(get_search_index().search, query)
+    local = [{"id": doc_id, "score": score, **document} for doc_id, score, document in results]
+    payload = {"query": query, "local": local}
+    if request.query_params.get("remote", "1") != "0":
+        try:
+            response = await run_in_threadpool(search_certifications, query, page)
+            payload["careeronestop"] = response.get("CertList") or []
+            payload["careeronestop_page"] = page
+            payload["careeronestop_total"] = record_count(response)
+        except CareerOneStopError as e:
+            payload["careeronestop_error"] = str(e)
+    return json_response(request, payload)
+
+
+def _feed_page_rows(rss_url, page): #Every job store read for a feed page; ingest holds the store lock for a whole batch, so keep this off the event loop
+    job_store = get_job_store()
+    postings = job_store.feed_page(rss_url, page, JOBS_PER_PAGE)
+    matches = job_store.matched_certifications([posting["id"] for posting in postings])
+    return job_store.feed_title(rss_url), postings, matches
+
+
+async def major_feed(request):
+    major = request.path_params["major"]
+    if major not in RSS_FEED_OPTIONS:
+        return error_response(request, 404, f"Unknown major: {major}")
+    try:
+        page = max(1, int(request.query_params.get("page", "1")))
+    except ValueError:
+        return error_response(request, 400, "'page' must be an integer")
+    rss_url = RSS_FEED_OPTIONS[major]
+    feed = await run_in_threadpool(request.app.state.feed_cache.get, rss_url)
+    title, postings, matches = await run_in_threadpool(_feed_page_rows, rss_url, page)
+    payload = {
+        "major": major,
+        "title": title,
+        "page": page,
+        "error": str(feed.get("bozo_exception")) if feed.get("bozo") == 1 else None,
+        "postings": [{**dict(posting), "certifications": [cert_id for cert_id, score in matches.get(posting["id"], [])]}
+                     for posting in postings],
+    }
+    return json_response(request, payload)
+
+
+async def metrics_text(request): #Prometheus scrape target; with --workers each process reports only its own numbers
+    return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app): #Per worker process: read-only view of the feed snapshots and job store, search index built up front
+    # Workers never fetch feeds or write postings; one writer does (see start_feed_writer), so adding
+    # workers doesn't add upstream requests or writers competing for the job store
+    metrics.set_window(METRICS_WINDOW)
+    app.state.feed_cache = FeedCache(refresh_interval=FEED_REFRESH_SECONDS, snapshot_dir=FEED_CACHE_DIR, fetch=False)
+    await run_in_threadpool(get_job_store)
+    await run_in_threadpool(get_search_index)
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route("/certifications/{major}", major_certifications),
+        Route("/search", search),
+        Route("/feeds/{major}", major_feed),
+        Route("/metrics", metrics_text),
+    ],
+    lifespan=lifespan,
+)
+
+
+def start_feed_writer(): #Refresh every feed each interval, snapshot it for the workers and ingest it into the job store
+    feed_cache = get_feed_cache(refresh_interval=FEED_REFRESH_SECONDS, snapshot_dir=FEED_CACHE_DIR)
+    feed_cache.add_listener(get_job_store().ingest)
+    threading.Thread(target=warm_up_configured, args=(feed_cache,), name="warm-up", daemon=True).start()
+    return feed_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve certifications, searches and job feeds as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="don't refresh feeds here, e.g. when the Streamlit app on this host already does")
+    args = parser.parse_args()
+    if not args.no_refresh:
+        start_feed_writer()  # in this process only: uvicorn's worker processes import the app, not main()
+    uvicorn.run("api_service:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
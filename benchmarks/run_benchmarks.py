@@ -0,0 +1,230 @@
+import argparse
+import ast
+import concurrent.futures
+import datetime
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.stubs import careeronestop_stub, rss_stub
+from benchmarks.synthetic import WORDS, synthetic_certification_details
+
+# Everything runs against local stand-ins: a stub CareerOneStop endpoint, generated RSS feeds and
+# synthetic catalogs. Results are written as JSON so runs on different commits can be compared:
+#   python -m benchmarks.run_benchmarks --output before.json
+#   python -m benchmarks.run_benchmarks --compare before.json
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def timed(fn, *args, **kwargs): #(seconds, result)
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def peak_memory(fn, *args, **kwargs): #Peak bytes allocated while fn runs; a separate pass, since tracing slows everything down
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def write_secrets(workdir, feed_urls, cos_url): #The app's modules read their configuration from .streamlit/secrets.toml
+    os.makedirs(os.path.join(workdir, ".streamlit"), exist_ok=True)
+    secrets = {
+        "COS_API_KEY": "benchmark",
+        "COS_USER_ID": "benchmark",
+        "RSS_CET_1": feed_urls[0],
+        "RSS_MET_1": feed_urls[1 % len(feed_urls)],
+        "RSS_CET_2": feed_urls[2 % len(feed_urls)],
+        "RSS_MET_2": feed_urls[3 % len(feed_urls)],
+        "FEED_CACHE_DIR": os.path.join(workdir, "feeds"),
+        "JOB_STORE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "COS_CACHE_PATH": os.path.join(workdir, "careeronestop.sqlite3"),
+        "COS_MAX_RETRIES": 2,
+        "WARMUP_KEYWORDS": [],
+    }
+    with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w") as f:
+        for key, value in secrets.items():
+            f.write(f"{key} = {json.dumps(value)}\n")
+
+
+def bench_feeds(metrics, stub, sizes):
+    import feedparser
+    import requests
+    from feed_cache import get_feed_cache
+    from job_panel import display_rss_feed, postings_html
+    from job_store import get_job_store
+
+    feed_cache = get_feed_cache(refresh_interval=3600)
+    job_store = get_job_store()
+    feed_cache.add_listener(job_store.ingest)
+    for size in sizes:
+        url = f"{stub.url}/feeds/{size}/0"
+        content = requests.get(url).content
+        metrics[f"feed.{size}.parse_seconds"], feed = timed(feedparser.parse, content)
+        metrics[f"feed.{size}.parse_peak_bytes"] = peak_memory(feedparser.parse, content)
+        metrics[f"feed.{size}.ingest_seconds"], _ = timed(job_store.ingest, url, feed)
+        metrics[f"feed.{size}.reingest_seconds"], _ = timed(job_store.ingest, url, feed)
+        feed_cache.refresh(url)
+        metrics[f"feed.{size}.render_page_seconds"], _ = timed(display_rss_feed, url, 1)
+        metrics[f"feed.{size}.render_all_seconds"], _ = timed(lambda: postings_html(job_store.feed_page(url, 1, size)))
+    metrics["feed.search_seconds"], _ = timed(job_store.search, "network technician")
+
+
+def bench_catalog(metrics, workdir, majors):
+    from build_catalog import build_catalog
+    from catalog import load_catalog
+    from cert_panel import _render_cert
+    from search_index import CertSearchIndex
+
+    details = synthetic_certification_details(majors)
+    literal = repr(details)  # what a generated preprocessed_cert_data.py would hold
+    metrics["catalog.literal_bytes"] = len(literal.encode("utf-8"))
+    metrics["catalog.build_seconds"], catalog = timed(build_catalog, details)
+    path = os.path.join(workdir, "cert_catalog.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, separators=(",", ":"), ensure_ascii=False)
+    metrics["catalog.file_bytes"] = os.path.getsize(path)
+    metrics["catalog.load_seconds"], _ = timed(load_catalog.__wrapped__, path)
+    metrics["catalog.load_peak_bytes"] = peak_memory(load_catalog.__wrapped__, path)
+    metrics["catalog.literal_parse_peak_bytes"] = peak_memory(ast.literal_eval, literal)
+
+    render_times = []
+    for major, entries in catalog["majors"].items():
+        seconds, _ = timed(lambda: "\n\n".join(_render_cert(name, catalog["certifications"][cert_id]) for name, cert_id in entries))
+        render_times.append(seconds)
+    metrics["catalog.render_major_p50_seconds"] = percentile(render_times, 50)
+    metrics["catalog.render_major_p99_seconds"] = percentile(render_times, 99)
+
+    index = CertSearchIndex()
+    metrics["catalog.index_build_seconds"], _ = timed(index.add_catalog, catalog["certifications"])
+    return index
+
+
+def bench_sessions(metrics, workdir, cos_stub, feed_urls, index, sessions, searches_per_session, seed):
+    from careeronestop import CareerOneStopClient, CareerOneStopError
+    from job_panel import display_rss_feed
+    from response_cache import ResponseCache
+
+    client = CareerOneStopClient("benchmark", "benchmark", ResponseCache(os.path.join(workdir, "sessions.sqlite3")),
+                                 base_url=cos_stub.url, backoff=0.05)
+    client.add_listener(lambda keyword, response: index.add_cert_list(response.get("CertList") or []))
+    # A few popular keywords and a long tail, as during advising weeks
+    keywords = WORDS[:40]
+    weights = [1 / (rank + 1) for rank in range(len(keywords))]
+    latencies = {"remote_search": [], "local_search": [], "feed_render": []}
+    errors = []
+
+    def session(number):
+        rng = random.Random(seed + number)
+        for _ in range(searches_per_session):
+            keyword = rng.choices(keywords, weights)[0]
+            prefix = keyword[:rng.randint(2, len(keyword))]
+            seconds, _ = timed(index.search, prefix)
+            latencies["local_search"].append(seconds)
+            start = time.perf_counter()
+            try:
+                client.search_certifications(keyword)
+            except CareerOneStopError:
+                errors.append(keyword)
+            latencies["remote_search"].append(time.perf_counter() - start)
+            seconds, _ = timed(display_rss_feed, rng.choice(feed_urls), 1)
+            latencies["feed_render"].append(seconds)
+
+    def run_sessions():
+        with concurrent.futures.ThreadPoolExecutor(sessions) as pool:
+            list(pool.map(session, range(sessions)))
+
+    wall, _ = timed(run_sessions)
+    for name, samples in latencies.items():
+        metrics[f"sessions.{name}_p50_seconds"] = percentile(samples, 50)
+        metrics[f"sessions.{name}_p99_seconds"] = percentile(samples, 99)
+    metrics["sessions.wall_seconds"] = wall
+    metrics["sessions.search_errors"] = len(errors)
+    metrics["sessions.upstream_search_calls"] = cos_stub.total_calls
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(metrics, previous):
+    print(f"\nCompared with {previous.get('commit')} ({previous.get('timestamp')}):")
+    for name, value in metrics.items():
+        before = previous["metrics"].get(name)
+        if before:
+            print(f"  {name:<45} {before:>14.6g} -> {value:<14.6g} {(value - before) / before:+.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feed, catalog and search hot paths against local stubs.")
+    parser.add_argument("--feed-sizes", default="10,100,1000,10000", help="comma-separated RSS entry counts")
+    parser.add_argument("--majors", type=int, default=300, help="majors in the synthetic catalog")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent simulated sessions")
+    parser.add_argument("--searches-per-session", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub CareerOneStop latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="fraction of stub CareerOneStop calls that return 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON here")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+    compare = os.path.abspath(args.compare) if args.compare else None
+
+    sizes = [int(size) for size in args.feed_sizes.split(",")]
+    cos_stub = careeronestop_stub(latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    feeds = rss_stub(set(sizes))
+    session_feed_urls = [f"{feeds.url}/feeds/{sizes[min(1, len(sizes) - 1)]}/{seed}" for seed in range(4)]
+    workdir = tempfile.mkdtemp(prefix="tc2-bench-")
+    write_secrets(workdir, session_feed_urls, cos_stub.url)
+    os.chdir(workdir)
+
+    metrics = {}
+    bench_feeds(metrics, feeds, sizes)
+    index = bench_catalog(metrics, workdir, args.majors)
+    bench_sessions(metrics, workdir, cos_stub, session_feed_urls, index, args.sessions, args.searches_per_session, args.seed)
+    metrics["upstream.feed_calls"] = feeds.total_calls
+    cos_stub.stop()
+    feeds.stop()
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, value in metrics.items():
+        print(f"{name:<45} {value:.6g}")
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "params": vars(args),
+        "metrics": metrics,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    if compare:
+        with open(compare) as f:
+            print_comparison(metrics, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
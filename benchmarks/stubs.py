@@ -0,0 +1,91 @@
+import http.server
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import unquote
+from benchmarks.synthetic import generate_rss, synthetic_cert_list
+
+CERTIFICATION_FINDER_PATH = re.compile(r"^/v1/certificationfinder/[^/]+/(?P<keyword>[^/]+)/(?:[^/]+/){8}(?P<start>\d+)/(?P<limit>\d+)$")
+
+
+class StubServer: #Local HTTP server on a free port, run in a background thread, counting requests per path
+    def __init__(self, handle):
+        self.calls = Counter()
+        self.bytes_sent = 0
+        self._counter_lock = threading.Lock()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real upstreams
+
+            def do_GET(self):
+                with stub._counter_lock:
+                    stub.calls[self.path] += 1
+                status, headers, body = handle(self)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._counter_lock:
+                    stub.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True).start()
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def careeronestop_stub(latency=0.05, error_rate=0.0, seed=0): #Imitates /v1/certificationfinder/... with latency and 503s
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+
+    def handle(request):
+        time.sleep(latency)
+        match = CERTIFICATION_FINDER_PATH.match(request.path)
+        if match is None:
+            return 404, {}, b"{}"
+        with rng_lock:
+            failed = rng.random() < error_rate
+        if failed:
+            return 503, {}, b"Service Unavailable"
+        keyword = unquote(match["keyword"])
+        body = json.dumps(synthetic_cert_list(keyword, int(match["start"]), int(match["limit"]) or 20)).encode("utf-8")
+        return 200, {"Content-Type": "application/json"}, body
+
+    return StubServer(handle)
+
+
+def rss_stub(sizes): #Serves /feeds/<entries>/<seed> with ETag revalidation, like Handshake's feeds
+    documents = {}
+    documents_lock = threading.Lock()
+
+    def handle(request):
+        parts = request.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "feeds" or int(parts[1]) not in sizes:
+            return 404, {}, b""
+        key = (int(parts[1]), int(parts[2]))
+        with documents_lock:
+            if key not in documents:
+                documents[key] = generate_rss(*key)
+        etag = f'"{key[0]}-{key[1]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": "application/rss+xml", "ETag": etag}, documents[key]
+
+    return StubServer(handle)
@@ -0,0 +1,76 @@
+import random
+from email.utils import formatdate
+
+WORDS = ("network security cloud systems technician welding cad design electrical automation robotics "
+         "maintenance programming database support hardware cisco comptia safety quality manufacturing "
+         "hvac plc solidworks autocad linux windows server wireless fiber inspection").split()
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def generate_rss(entries, seed=0, shared_every=10): #RSS 2.0 document; every shared_every-th posting is shared across feeds
+    rng = random.Random(seed)
+    items = []
+    for i in range(entries):
+        key = f"shared-{i}" if shared_every and i % shared_every == 0 else f"feed{seed}-{i}"
+        items.append(
+            "<item>"
+            f"<title>{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Job {key}</title>"
+            f"<link>https://jobs.example.edu/{key}</link>"
+            f"<guid>https://jobs.example.edu/{key}</guid>"
+            f"<description>{_sentence(rng, 40)}</description>"
+            f"<pubDate>{formatdate(1600000000 + i * 3600, usegmt=True)}</pubDate>"
+            "</item>"
+        )
+    return (
+        "<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+        f"<title>Synthetic feed ({entries} entries)</title><link>https://jobs.example.edu/</link>"
+        "<description>Benchmark feed</description>" + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def synthetic_certification_details(majors, certs_per_major=12, distinct_certs=200, seed=0): #Same shape as preprocessed_cert_data.certification_details
+    rng = random.Random(seed)
+    certs = []
+    for i in range(distinct_certs):
+        organization = f"{rng.choice(WORDS).title()} Institute {i % 40}"
+        certs.append((f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Certification {i}", {
+            "description": " ".join(_sentence(rng) for _ in range(4)),
+            "certifying_organization": organization,
+            "organization_url": f"https://org{i % 40}.example.org",
+            "details": {
+                "More than two years of education or training after high school required?": rng.choice(["Yes", "No"]),
+                "Oral or Written Exam Required?": rng.choice(["Yes", "No"]),
+                "Renewal Required?": f"Every {rng.randint(1, 5)} Year(s)",
+                "Renew through Continuing Educational Units(CEU)?": rng.choice(["Yes", "No"]),
+                "Renew through Re-Examination?": rng.choice(["Yes", "No"]),
+            },
+            "exam_details": _sentence(rng, 20),
+            "more_info_url": f"https://org{i % 40}.example.org/certs/{i}",
+        }))
+    details = {}
+    for m in range(majors):
+        # Like the real data, the same certification is listed under many majors, sometimes with a suffixed name
+        details[f"Major {m}"] = {
+            (name if rng.random() < 0.7 else f"{name} M{m}"): info
+            for name, info in rng.sample(certs, min(certs_per_major, len(certs)))
+        }
+    return details
+
+
+def synthetic_cert_list(keyword, start, limit, total=250): #CareerOneStop CertList page for a keyword
+    rng = random.Random(keyword)
+    agencies = ["IN-DEMAND", "MILITARY", "ANSI", "JOB CORPS", "NCCA", "NAM", "ABNS", "ICAC", "OTHER"]
+    cert_list = []
+    for i in range(start, min(start + limit, total)):
+        cert_list.append({
+            "Id": f"{keyword}-{i}",
+            "Name": f"{keyword.title()} {rng.choice(WORDS).title()} Certification {i}",
+            "Organization": f"{rng.choice(WORDS).title()} Board",
+            "Description": _sentence(rng, 30),
+            "Url": f"https://certs.example.org/{keyword}/{i}",
+            "CertAccredAgencyList": [{"Name": name} for name in rng.sample(agencies, rng.randint(0, 3))],
+        })
+    return {"RecordCount": total, "CertList": cert_list}
@@ -0,0 +1,78 @@
+import argparse
+import hashlib
+import json
+import re
+import sys
+from catalog import CATALOG_PATH, CatalogError, validate_catalog
+from preprocessed_cert_data import certification_details
+
+BODY_FIELDS = ("description", "certifying_organization", "organization_url", "details", "exam_details", "more_info_url")
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+def _cert_body(info): #Everything except the name, which varies per major for the same certification
+    return {field: info[field] if info[field] is not None else "" for field in BODY_FIELDS}
+
+def build_catalog(details_by_major): #Split {major: {name: info}} into a deduplicated cert table and a major -> cert id map
+    cert_ids = {}           # canonical JSON of a cert body -> id
+    certifications = {}
+    majors = {}
+    # Shortest names first, so "CCNA Certification" names the block also listed as "CCNA Certification CET1"
+    all_certs = [(major, name, info) for major, certs in details_by_major.items() for name, info in certs.items()]
+    for major, name, info in sorted(all_certs, key=lambda item: (len(item[1]), item[1])):
+        body = _cert_body(info)
+        key = json.dumps(body, sort_keys=True)
+        if key not in cert_ids:
+            cert_id = _slug(name)
+            suffix = 2
+            while cert_id in certifications:
+                cert_id = f"{_slug(name)}-{suffix}"
+                suffix += 1
+            cert_ids[key] = cert_id
+            certifications[cert_id] = {"name": name, **body}
+    for major, certs in details_by_major.items():
+        majors[major] = []
+        for name, info in certs.items():
+            majors[major].append([name, cert_ids[json.dumps(_cert_body(info), sort_keys=True)]])
+
+    content = json.dumps({"certifications": certifications, "majors": majors}, sort_keys=True, separators=(",", ":"))
+    catalog = {"version": hashlib.sha256(content.encode("utf-8")).hexdigest()[:16], "certifications": certifications, "majors": majors}
+    validate_catalog(catalog)
+    return catalog
+
+def serialize(catalog): #File contents for a catalog; no sort_keys, since details and majors display in source order
+    return json.dumps(catalog, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Build cert_catalog.json from preprocessed_cert_data.py.")
+    parser.add_argument("--output", default=CATALOG_PATH)
+    parser.add_argument("--check", action="store_true", help="fail if the catalog file is out of date instead of writing it")
+    args = parser.parse_args()
+
+    try:
+        catalog = build_catalog(certification_details)
+    except (CatalogError, KeyError) as e:
+        print(f"Invalid certification data: {e}", file=sys.stderr)
+        return 1
+    serialized = serialize(catalog)
+
+    if args.check:
+        try:
+            with open(args.output, encoding="utf-8") as f:
+                up_to_date = f.read() == serialized
+        except OSError:
+            up_to_date = False
+        if not up_to_date:
+            print(f"{args.output} is out of date; run python build_catalog.py", file=sys.stderr)
+            return 1
+        return 0
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(serialized)
+    shared = sum(len(certs) for certs in catalog["majors"].values())
+    print(f"Wrote {args.output}: {len(catalog['majors'])} majors, {shared} listings, {len(catalog['certifications'])} distinct certifications")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
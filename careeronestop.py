@@ -0,0 +1,159 @@
+import queue
+import random
+import threading
+import time
+import concurrent.futures
+import requests
+from requests.adapters import HTTPAdapter
+from config import (
+    BASE_URL, CAREERONESTOP_API_KEY, CAREERONESTOP_USER_ID,
+    COS_CACHE_MAX_ENTRIES, COS_CACHE_PATH, COS_CACHE_TTL_SECONDS,
+    COS_MAX_RETRIES, COS_PAGE_SIZE, COS_POOL_SIZE, COS_TIMEOUT_SECONDS,
+)
+from response_cache import ResponseCache
+import metrics
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+PREFETCH_WORKERS = 2
+
+
+class CareerOneStopError(Exception):
+    pass
+
+
+def normalize_keyword(keyword): #"  Network  Security " and "network security" are the same search
+    return " ".join(keyword.lower().split())
+
+
+def record_count(response): #Total matches reported by the API, across all pages
+    try:
+        return int(response.get("RecordCount") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class CareerOneStopClient: #Pooled, retrying, cached client for the certification finder API
+    def __init__(self, api_key, user_id, cache, base_url=BASE_URL, timeout=COS_TIMEOUT_SECONDS,
+                 max_retries=COS_MAX_RETRIES, pool_size=COS_POOL_SIZE, backoff=0.5, page_size=COS_PAGE_SIZE):
+        self.user_id = user_id
+        self.base_url = base_url
+        self.cache = cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.page_size = page_size
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Accept": "application/json"
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._in_flight = {}        # cache key -> Future shared by every caller waiting on it
+        self._in_flight_lock = threading.Lock()
+        self._listeners = []
+        # Daemon workers rather than an executor, whose threads are joined at exit and would wait out a slow upstream
+        self._prefetch_queue = queue.Queue()
+        for i in range(PREFETCH_WORKERS):
+            threading.Thread(target=self._prefetch_loop, name=f"careeronestop-prefetch-{i}", daemon=True).start()
+
+    def add_listener(self, listener): #listener(keyword, response) is called for every fresh upstream response
+        self._listeners.append(listener)
+
+    def certification_search_url(self, keyword, start=0, limit=None): #Certification finder endpoint for one page of results
+        keyword = requests.utils.quote(keyword, safe="")
+        limit = limit or self.page_size
+        # The eight zeros are the unused filters; the last two segments are startRecord and limitRecord
+        return f"{self.base_url}/v1/certificationfinder/{self.user_id}/{keyword}/0/0/0/0/0/0/0/0/{start}/{limit}"
+
+    def search_certifications(self, keyword, page=1, prefetch=True): #One cached page of results; the next page is fetched in the background
+        keyword = normalize_keyword(keyword)
+        data = self._search_page(keyword, page)
+        if prefetch and page * self.page_size < record_count(data):
+            self._prefetch_queue.put((keyword, page + 1))
+        return data
+
+    def _cache_key(self, keyword, page):
+        return f"certificationfinder:{keyword}:{(page - 1) * self.page_size}:{self.page_size}"
+
+    def _prefetch_loop(self):
+        while True:
+            self._prefetch_page(*self._prefetch_queue.get())
+
+    def _prefetch_page(self, keyword, page):
+        if self.cache.get(self._cache_key(keyword, page)) is not None:
+            return
+        try:
+            self._search_page(keyword, page)
+        except Exception:
+            pass  # best effort: the user's own request for this page will retry and report the error
+
+    def _search_page(self, keyword, page): #Cached page; concurrent identical requests share one upstream call
+        cache_key = self._cache_key(keyword, page)
+        cached = self.cache.get(cache_key)
+        metrics.record_cache("careeronestop", cached is not None)
+        if cached is not None:
+            return cached
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(cache_key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._in_flight[cache_key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            data = self._get_json(self.certification_search_url(keyword, (page - 1) * self.page_size, self.page_size))
+            self.cache.put(cache_key, data)
+            for listener in self._listeners:
+                listener(keyword, data)
+            future.set_result(data)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[cache_key]
+        return future.result()
+
+    def _get_json(self, url): #GET with bounded timeouts and jittered exponential backoff on transient failures
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                with metrics.span("careeronestop_fetch"):
+                    response = self.session.get(url, timeout=self.timeout)
+                metrics.record_upstream("careeronestop", response.status_code, len(response.content))
+                if response.status_code in RETRY_STATUS_CODES and not last_attempt:
+                    raise requests.exceptions.HTTPError(f"{response.status_code} from CareerOneStop", response=response)
+                response.raise_for_status()
+                return response.json()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError) as e:
+                if e.response is None:
+                    metrics.record_upstream("careeronestop", "error", 0)
+                retryable = e.response is None or e.response.status_code in RETRY_STATUS_CODES
+                if last_attempt or not retryable:
+                    raise CareerOneStopError(f"Error fetching data from the API: {e}") from e
+            except requests.exceptions.JSONDecodeError as e:
+                raise CareerOneStopError(f"Error decoding JSON response: {e}") from e
+            except requests.exceptions.RequestException as e:
+                raise CareerOneStopError(f"Error fetching data from the API: {e}") from e
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(): #One client (and connection pool) per process, configured from secrets
+    global _client
+    with _client_lock:
+        if _client is None:
+            cache = ResponseCache(COS_CACHE_PATH, ttl=COS_CACHE_TTL_SECONDS, max_entries=COS_CACHE_MAX_ENTRIES)
+            _client = CareerOneStopClient(CAREERONESTOP_API_KEY, CAREERONESTOP_USER_ID, cache)
+        return _client
+
+
+def search_certifications(keyword, page=1, prefetch=True):
+    return get_client().search_certifications(keyword, page, prefetch)
@@ -0,0 +1,76 @@
+import functools
+import json
+import os
+import sys
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cert_catalog.json")
+CERT_FIELDS = {
+    "name": str,
+    "description": str,
+    "certifying_organization": str,
+    "organization_url": str,
+    "details": dict,
+    "exam_details": str,
+    "more_info_url": str,
+}
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def validate_catalog(catalog): #Raise CatalogError unless catalog matches the cert_catalog.json schema
+    if not isinstance(catalog, dict) or set(catalog) != {"version", "certifications", "majors"}:
+        raise CatalogError("catalog must have exactly 'version', 'certifications' and 'majors'")
+    if not isinstance(catalog["version"], str):
+        raise CatalogError("'version' must be a string")
+    for cert_id, cert in catalog["certifications"].items():
+        if not isinstance(cert, dict) or set(cert) != set(CERT_FIELDS):
+            raise CatalogError(f"certification {cert_id!r} must have exactly {sorted(CERT_FIELDS)}")
+        for field, field_type in CERT_FIELDS.items():
+            if not isinstance(cert[field], field_type):
+                raise CatalogError(f"certification {cert_id!r}: {field!r} must be a {field_type.__name__}")
+        if not all(isinstance(key, str) and isinstance(value, str) for key, value in cert["details"].items()):
+            raise CatalogError(f"certification {cert_id!r}: 'details' must map strings to strings")
+    for major, entries in catalog["majors"].items():
+        if not isinstance(entries, list):
+            raise CatalogError(f"major {major!r} must be a list of [display name, certification id] pairs")
+        for entry in entries:
+            if not (isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str)):
+                raise CatalogError(f"major {major!r}: bad entry {entry!r}")
+            if entry[1] not in catalog["certifications"]:
+                raise CatalogError(f"major {major!r}: unknown certification id {entry[1]!r}")
+
+
+def _intern_strings(value): #Detail labels and values repeat across certifications; keep one copy of each
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {_intern_strings(key): _intern_strings(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(item) for item in value]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(path=CATALOG_PATH): #Read on first use, not at import, so pages that never need it don't pay for it
+    with open(path, encoding="utf-8") as f:
+        return _intern_strings(json.load(f))
+
+
+def catalog_version():
+    return load_catalog()["version"]
+
+
+def majors():
+    return list(load_catalog()["majors"])
+
+
+def certifications(): #cert id -> certification info, one entry per distinct certification
+    return load_catalog()["certifications"]
+
+
+@functools.lru_cache(maxsize=None)
+def certifications_for_major(major): #{display name: cert info} in the shape of certification_details[major]; the dicts are shared
+    catalog = load_catalog()
+    return {display_name: catalog["certifications"][cert_id] for display_name, cert_id in catalog["majors"][major]}
@@ -0,0 +1,70 @@
+import math
+import threading
+import streamlit as st
+from catalog import certifications_for_major
+import metrics
+
+CERTS_PER_PAGE = 10
+_cache_state = threading.local()  # st.cache_data doesn't report hits, so the cached body flags misses
+
+AGENCY_BADGES = { #CareerOneStop accrediting agency name (upper-cased) -> badge markdown
+    "IN-DEMAND": ":red-badge[In-Demand]",
+    "MILITARY": ":green-badge[Military]",
+    "ANSI": ":blue-badge[ANSI]",
+    "JOB CORPS": ":violet-badge[Job Corps]",
+    "NCCA": ":violet-badge[NCCA]",
+    "NAM": ":violet-badge[NAM]",
+    "ABNS": ":violet-badge[ABNS]",
+    "ICAC": ":violet-badge[ICAC]",
+}
+
+def page_count(major, page_size=CERTS_PER_PAGE):
+    return max(1, math.ceil(len(certifications_for_major(major)) / page_size))
+
+def _render_cert(cert_name, cert_info): #Markdown for one certification, matching the old per-element layout
+    lines = [
+        f"### {cert_name}",
+        f"**Description:** {cert_info['description']}",
+        "",
+        f"**Certifying Organization:** [{cert_info['certifying_organization']}]({cert_info['organization_url']})",
+        "",
+        "### Certification Details",
+    ]
+    lines.extend(f"- **{detail}**: {value}" for detail, value in cert_info['details'].items())
+    lines.append("")
+    if cert_info['exam_details']:
+        lines.extend(["### Exam Details", cert_info['exam_details'], ""])
+    if cert_info['more_info_url']:
+        lines.extend(["### More Information", f"[More on {cert_name}]({cert_info['more_info_url']})", ""])
+    lines.append("---")
+    return "\n".join(lines)
+
+@st.cache_data(max_entries=1000)
+def _render_major_panel_cached(major, catalog_version, page, page_size):
+    _cache_state.miss = True
+    certs = list(certifications_for_major(major).items())
+    start = (page - 1) * page_size
+    return "\n\n".join(_render_cert(cert_name, cert_info) for cert_name, cert_info in certs[start:start + page_size])
+
+def render_major_panel(major, catalog_version, page=1, page_size=CERTS_PER_PAGE): #One markdown block per (catalog version, major, page)
+    _cache_state.miss = False
+    with metrics.span("cert_panel_markdown"):
+        markdown = _render_major_panel_cached(major, catalog_version, page, page_size)
+    metrics.record_cache("render_major_panel", not _cache_state.miss)
+    return markdown
+
+def _render_cert_list_entry(cert): #Markdown for one CareerOneStop CertList entry
+    lines = [f"**{cert.get('Name', 'N/A')}**", ""]
+    badges = [AGENCY_BADGES.get((agency.get("Name") or "").upper()) for agency in cert.get("CertAccredAgencyList") or []]
+    badges = [badge for badge in badges if badge]
+    if badges:
+        lines.extend([" ".join(badges), ""])
+    lines.extend([f"Organization: {cert.get('Organization', 'N/A')}", "", f"Description: {cert.get('Description', 'N/A')}", ""])
+    if cert.get("Url"):
+        lines.extend([f"[More Info]({cert['Url']})", ""])
+    lines.append("---")
+    return "\n".join(lines)
+
+def render_cert_list(cert_list): #One markdown block per page of CareerOneStop results
+    with metrics.span("cert_list_markdown"):
+        return "\n\n".join(_render_cert_list_entry(cert) for cert in cert_list)
@@ -0,0 +1,39 @@
+import streamlit as st
+
+# Access the API key from Streamlit secrets
+CAREERONESTOP_API_KEY = st.secrets["COS_API_KEY"]
+CAREERONESTOP_USER_ID = st.secrets["COS_USER_ID"]
+BASE_URL = "https://api.careeronestop.org"
+
+RSS_FEED_OPTIONS = {
+    "Computer Engineering Technology 1": st.secrets["RSS_CET_1"],
+    "Mechanical Engineering Technology 1": st.secrets["RSS_MET_1"],
+    "Computer Engineering Technology 2": st.secrets["RSS_CET_2"],
+    "Mechanical Engineering Technology 2": st.secrets["RSS_MET_2"]
+}
+
+# CareerOneStop client: pooled session, retries, and an on-disk response cache shared across restarts
+COS_TIMEOUT_SECONDS = float(st.secrets.get("COS_TIMEOUT_SECONDS", 10))
+COS_MAX_RETRIES = int(st.secrets.get("COS_MAX_RETRIES", 3))
+COS_POOL_SIZE = int(st.secrets.get("COS_POOL_SIZE", 20))
+COS_CACHE_PATH = st.secrets.get("COS_CACHE_PATH", ".cache/careeronestop.sqlite3")
+COS_CACHE_TTL_SECONDS = int(st.secrets.get("COS_CACHE_TTL_SECONDS", 86400))
+COS_CACHE_MAX_ENTRIES = int(st.secrets.get("COS_CACHE_MAX_ENTRIES", 5000))
+COS_PAGE_SIZE = int(st.secrets.get("COS_PAGE_SIZE", 20))  # results per certification finder call; the next page is prefetched
+SEARCH_INDEX_MAX_API_DOCUMENTS = int(st.secrets.get("SEARCH_INDEX_MAX_API_DOCUMENTS", 10000))  # CareerOneStop results kept for local search
+
+# Feeds are shared by all sessions and revalidated in the background every FEED_REFRESH_SECONDS
+FEED_REFRESH_SECONDS = int(st.secrets.get("FEED_REFRESH_SECONDS", 300))
+FEED_CACHE_DIR = st.secrets.get("FEED_CACHE_DIR", ".cache/feeds")
+# Every feed's postings are kept, deduplicated and full-text indexed, in this SQLite file
+JOB_STORE_PATH = st.secrets.get("JOB_STORE_PATH", ".cache/jobs.sqlite3")
+JOBS_PER_PAGE = int(st.secrets.get("JOBS_PER_PAGE", 25))
+
+# Fetched concurrently when the process starts (and by `python warmup.py`) so the first visitor doesn't wait
+WARMUP_KEYWORDS = list(st.secrets.get("WARMUP_KEYWORDS", ["network", "cisco", "comptia", "autocad", "solidworks", "welding"]))
+WARMUP_TIMEOUT_SECONDS = float(st.secrets.get("WARMUP_TIMEOUT_SECONDS", 20))
+
+# Operator metrics: Prometheus text on METRICS_PORT (0 turns it off) and the ?admin=metrics page (off without a token)
+METRICS_PORT = int(st.secrets.get("METRICS_PORT", 0))
+METRICS_ADMIN_TOKEN = st.secrets.get("METRICS_ADMIN_TOKEN", "")
+METRICS_WINDOW = int(st.secrets.get("METRICS_WINDOW", 1024))
@@ -0,0 +1,253 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import requests
+import feedparser
+import metrics
+
+DEFAULT_REFRESH_INTERVAL = 300
+DEFAULT_FETCH_TIMEOUT = 10
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_feed(content, headers):
+    # feedparser only looks up lowercase header names; passed as-is, every feed came back bozo ("no Content-type specified")
+    return feedparser.parse(content, response_headers={key.lower(): value for key, value in headers.items()})
+
+
+class FeedCache: #Process-wide store of parsed RSS feeds shared by every session
+    def __init__(self, refresh_interval=DEFAULT_REFRESH_INTERVAL, fetch_timeout=DEFAULT_FETCH_TIMEOUT, snapshot_dir=None, fetch=True):
+        self.refresh_interval = refresh_interval
+        self.fetch_timeout = fetch_timeout
+        self.snapshot_dir = snapshot_dir  # when set, feeds survive restarts and can be warmed by another process
+        self.fetch = fetch  # False: never touch the network, only (re)load the snapshots another process writes
+        self._feeds = {}            # url -> {"feed", "etag", "modified", "fetched_at", "failed"}
+        self._stats = {}            # url -> hit/miss/refresh counters
+        self._url_locks = {}        # url -> lock held while that feed is being fetched
+        self._revalidating = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+
+    def add_listener(self, listener): #listener(url, feed) is called whenever a feed's content is (re)loaded
+        self._listeners.append(listener)
+
+    def get(self, url): #Return the cached feed, fetching only if we have never seen it
+        with self._lock:
+            cached = self._feeds.get(url)
+        from_snapshot = False
+        if cached is None:
+            cached, from_snapshot = self._adopt_snapshot(url)
+        with self._lock:
+            self._count(url, "hits" if cached else "misses")
+        metrics.record_cache("feeds", cached is not None)
+        if cached is None:
+            return self.refresh(url)
+        if from_snapshot:
+            self._notify(url, cached["feed"])
+        if time.time() - cached["fetched_at"] >= self.refresh_interval:
+            self._revalidate_in_background(url)  # serve stale content while it revalidates
+        return cached["feed"]
+
+    def refresh(self, url): #Conditional GET of one feed; keeps the last good copy on failure
+        if not self.fetch:
+            return self._reload_snapshot(url)
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            with self._lock:
+                cached = self._feeds.get(url)
+            from_snapshot = False
+            if cached is None:
+                cached, from_snapshot = self._adopt_snapshot(url)
+            if from_snapshot:
+                self._notify(url, cached["feed"])
+            request_headers = {}
+            if cached and cached["etag"]:
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached and cached["modified"]:
+                request_headers["If-Modified-Since"] = cached["modified"]
+
+            try:
+                with metrics.span("feed_fetch"):
+                    response = requests.get(url, headers=request_headers, timeout=self.fetch_timeout)
+                metrics.record_upstream("rss", response.status_code, len(response.content))
+                if response.status_code == 304 and cached:
+                    with self._lock:
+                        cached["fetched_at"] = time.time()
+                        self._count(url, "not_modified")
+                    return cached["feed"]
+                response.raise_for_status()
+                with metrics.span("feed_parse"):
+                    feed = _parse_feed(response.content, response.headers)
+            except requests.exceptions.RequestException as e:
+                if e.response is None:
+                    metrics.record_upstream("rss", "error", 0)
+                with self._lock:
+                    self._count(url, "errors")
+                    if cached and not cached.get("failed"):
+                        cached["fetched_at"] = time.time()
+                        return cached["feed"]
+                    # No good copy to fall back on: remember the failure too, so renders serve it instead of
+                    # refetching, and only the refresher or a background revalidation tries again
+                    failed = feedparser.FeedParserDict(bozo=1, bozo_exception=e, entries=[], feed={})
+                    self._feeds[url] = {"feed": failed, "etag": None, "modified": None, "fetched_at": time.time(), "failed": True}
+                return failed
+
+            fetched_at = time.time()
+            with self._lock:
+                self._feeds[url] = {
+                    "feed": feed,
+                    "etag": response.headers.get("ETag"),
+                    "modified": response.headers.get("Last-Modified"),
+                    "fetched_at": fetched_at,
+                    "failed": False,
+                }
+                self._count(url, "refreshes")
+            self._save_snapshot(url, response, fetched_at)
+            self._notify(url, feed)
+            return feed
+
+    def refresh_all(self):
+        with self._lock:
+            urls = list(self._feeds)
+        for url in urls:
+            try:
+                self.refresh(url)
+            except Exception:
+                logger.exception("Refreshing %s failed", url)  # one bad feed mustn't stop the others or the refresher
+
+    def start_refresher(self): #Background thread revalidating every known feed each interval
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="feed-cache-refresher", daemon=True)
+            self._refresher.start()
+
+    def stop_refresher(self):
+        self._stop.set()
+
+    def stats(self): #Per-feed counters: hits, misses, refreshes, not_modified, errors
+        with self._lock:
+            return {url: dict(counters) for url, counters in self._stats.items()}
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_all()
+
+    def _notify(self, url, feed): #Must be called without holding self._lock; listener errors are logged, not raised
+        failed = False
+        for listener in self._listeners:
+            try:
+                listener(url, feed)
+            except Exception:
+                logger.exception("Feed listener %r failed for %s", listener, url)
+                failed = True
+        if failed:
+            # Drop the validators so the next refresh downloads the feed and notifies again instead of getting a 304
+            with self._lock:
+                cached = self._feeds.get(url)
+                if cached is not None and cached["feed"] is feed:
+                    cached["etag"] = cached["modified"] = None
+
+    def _revalidate_in_background(self, url):
+        with self._lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def run():
+            try:
+                self.refresh(url)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(url)
+
+        threading.Thread(target=run, name="feed-cache-revalidate", daemon=True).start()
+
+    def _snapshot_path(self, url):
+        return os.path.join(self.snapshot_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _adopt_snapshot(self, url): #(entry, loaded) for a feed not in memory; disk I/O and parsing happen outside self._lock
+        snapshot = self._load_snapshot(url)
+        if snapshot is None:
+            return None, False
+        with self._lock:
+            cached = self._feeds.get(url)
+            if cached is not None:  # another thread got there first
+                return cached, False
+            self._feeds[url] = snapshot
+        return snapshot, True
+
+    def _reload_snapshot(self, url): #Read-only caches "refresh" from disk; the writer's fetched_at isn't bumped on a 304, so this uses its own
+        snapshot = self._load_snapshot(url)
+        if snapshot is None:
+            return feedparser.FeedParserDict(bozo=1, bozo_exception="Feed not fetched yet", entries=[], feed={})
+        snapshot["fetched_at"] = time.time()
+        with self._lock:
+            self._feeds[url] = snapshot
+            self._count(url, "refreshes")
+        return snapshot["feed"]
+
+    def _load_snapshot(self, url): #Snapshots hold the raw response, not pickled objects, and are parsed again on load
+        if not self.snapshot_dir:
+            return None
+        try:
+            with open(self._snapshot_path(url), encoding="utf-8") as f:
+                snapshot = json.load(f)
+            content = base64.b64decode(snapshot["content"], validate=True)
+            headers = dict(snapshot["headers"])
+            fetched_at = float(snapshot["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return {
+            "feed": _parse_feed(content, headers),
+            "etag": snapshot.get("etag"),
+            "modified": snapshot.get("modified"),
+            "fetched_at": fetched_at,
+            "failed": False,
+        }
+
+    def _save_snapshot(self, url, response, fetched_at):
+        if not self.snapshot_dir:
+            return
+        path = self._snapshot_path(url)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        snapshot = {
+            "url": url,
+            "content": base64.b64encode(response.content).decode("ascii"),
+            "headers": dict(response.headers),
+            "etag": response.headers.get("ETag"),
+            "modified": response.headers.get("Last-Modified"),
+            "fetched_at": fetched_at,
+        }
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(temporary, path)
+        except OSError:
+            pass  # a missing snapshot only costs one extra fetch after restart
+
+    def _count(self, url, counter): #Caller must hold self._lock
+        counters = self._stats.setdefault(url, {"hits": 0, "misses": 0, "refreshes": 0, "not_modified": 0, "errors": 0})
+        counters[counter] += 1
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_feed_cache(refresh_interval=DEFAULT_REFRESH_INTERVAL, snapshot_dir=None): #One FeedCache per process, refresher started on first use
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = FeedCache(refresh_interval=refresh_interval, snapshot_dir=snapshot_dir)
+            _shared_cache.start_refresher()
+        return _shared_cache
@@ -0,0 +1,45 @@
+import datetime
+import math
+from catalog import certifications
+from config import JOBS_PER_PAGE
+from feed_cache import get_feed_cache
+from job_store import get_job_store
+import metrics
+
+def posting_html(posting, matches): #One job posting row from the job store, with its precomputed certification matches
+    parts = [f"<strong><a href='{posting['link'] or '#'}' target='_blank'>{posting['title']}</a></strong><br>"]
+    if posting['published_ts'] is not None:
+        published_date = datetime.datetime.fromtimestamp(posting['published_ts'], datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        parts.append(f"<small><em>{published_date}</em></small><br>")
+    elif posting['published']:
+        parts.append(f"<small><em>{posting['published']}</em></small><br>")
+    cert_names = ", ".join(certifications()[cert_id]["name"] for cert_id, score in matches or [] if cert_id in certifications())
+    if cert_names:
+        parts.append(f"<small>Related certifications: {cert_names}</small><br>")
+    parts.append(f"<div style='margin-left: 10px;'>{posting['description']}</div><hr>")
+    return "".join(parts)
+
+def postings_html(postings): #Matches for the whole page come from one lookup
+    matches = get_job_store().matched_certifications([posting['id'] for posting in postings])
+    return "".join(posting_html(posting, matches.get(posting['id'])) for posting in postings)
+
+@metrics.timed("rss_render")
+def display_rss_feed(rss_url, page=1, feed=None): #Function to display RSS Feed, one page at a time from the job store
+    if feed is None:
+        feed = get_feed_cache().get(rss_url)  # fetches (and ingests) the feed the first time this process sees it
+    job_store = get_job_store()
+    if feed.get('bozo') == 1:
+        feed_content = f"<p style='color: red;'>Error fetching or parsing RSS feed: {feed.get('bozo_exception')}</p>"
+    else:
+        feed_content = f"<h3>{job_store.feed_title(rss_url) or 'RSS Feed'}</h3>" + postings_html(job_store.feed_page(rss_url, page, JOBS_PER_PAGE))
+    return f'<div>{feed_content}</div>'
+
+def job_page_count(rss_url): #Callers get the feed from the cache first, so it has been ingested
+    return max(1, math.ceil(get_job_store().count(rss_url) / JOBS_PER_PAGE))
+
+@metrics.timed("job_search")
+def display_job_search(query): #Matching postings from every feed, best first
+    postings = get_job_store().search(query)
+    if not postings:
+        return "<div><p>No job postings match your search.</p></div>"
+    return f"<div>{postings_html(postings)}</div>"
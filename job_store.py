@@ -0,0 +1,198 @@
+import calendar
+import os
+import re
+import sqlite3
+import threading
+import time
+from config import JOB_STORE_PATH
+from matching import get_cert_matcher
+import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    guid TEXT UNIQUE,
+    link TEXT UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    published TEXT,
+    published_ts REAL,
+    first_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_published_ts ON postings (published_ts);
+CREATE TABLE IF NOT EXISTS posting_feeds (
+    posting_id INTEGER NOT NULL REFERENCES postings (id),
+    feed_url TEXT NOT NULL,
+    last_seen REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (feed_url, posting_id)
+);
+CREATE TABLE IF NOT EXISTS posting_certs (
+    posting_id INTEGER NOT NULL REFERENCES postings (id),
+    cert_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (posting_id, cert_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5 (
+    title, description, content='postings', content_rowid='id'
+);
+"""
+POSTING_COLUMNS = "p.id, p.title, p.link, p.description, p.published, p.published_ts"
+# Newest first; postings without a date go last
+ORDER_BY_PUBLISHED = "ORDER BY p.published_ts IS NULL, p.published_ts DESC, p.id DESC"
+
+
+def _fts_query(text): #Turn free text into an FTS5 query: every word must match, as a prefix
+    words = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class JobStore: #SQLite store of job postings from every feed, deduplicated and full-text searchable
+    def __init__(self, path, matcher=None):
+        self.matcher = matcher  # when set, new postings are matched to certifications as they're ingested
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(posting_feeds)")}
+            if "last_seen" not in columns:  # stores created before postings aged out of feeds
+                self._conn.execute("ALTER TABLE posting_feeds ADD COLUMN last_seen REAL NOT NULL DEFAULT 0")
+        if matcher is not None:
+            self._rematch_if_catalog_changed()
+
+    def ingest(self, feed_url, feed): #Insert only postings we haven't seen by GUID or link, drop ones the feed no longer lists; returns how many were new
+        new_postings = []
+        now = time.time()
+        with metrics.span("job_ingest"), self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO feeds (url, title, ingested_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (url) DO UPDATE SET title = excluded.title, ingested_at = excluded.ingested_at",
+                (feed_url, feed.get('feed', {}).get('title'), now),
+            )
+            for entry in feed.get('entries', []):
+                guid = entry.get('id')
+                link = entry.get('link')
+                if not guid and not link:
+                    continue
+                # The same posting shows up in several majors' feeds; match on either identifier
+                row = self._conn.execute(
+                    "SELECT id FROM postings WHERE guid = ? OR link = ?", (guid, link)
+                ).fetchone()
+                if row is None:
+                    published_parsed = entry.get('published_parsed')
+                    cursor = self._conn.execute(
+                        "INSERT INTO postings (guid, link, title, description, published, published_ts, first_seen)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (guid, link, entry.get('title', 'No Title'), entry.get('description', 'No Description'),
+                         entry.get('published'), calendar.timegm(published_parsed) if published_parsed else None, now),
+                    )
+                    posting_id = cursor.lastrowid
+                    self._conn.execute(
+                        "INSERT INTO postings_fts (rowid, title, description) SELECT id, title, description FROM postings WHERE id = ?",
+                        (posting_id,),
+                    )
+                    new_postings.append((posting_id, f"{entry.get('title', '')} {entry.get('description', '')}"))
+                else:
+                    posting_id = row["id"]
+                self._conn.execute(
+                    "INSERT INTO posting_feeds (feed_url, posting_id, last_seen) VALUES (?, ?, ?)"
+                    " ON CONFLICT (feed_url, posting_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    (feed_url, posting_id, now),
+                )
+            if feed.get('entries'):
+                # Filled or expired jobs drop out of the feed; an empty (likely broken) feed keeps what we had
+                self._conn.execute("DELETE FROM posting_feeds WHERE feed_url = ? AND last_seen < ?", (feed_url, now))
+            self._store_matches(new_postings)
+        return len(new_postings)
+
+    def matched_certifications(self, posting_ids): #{posting id: [(cert id, score)] best first}
+        if not posting_ids:
+            return {}
+        placeholders = ", ".join("?" * len(posting_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT posting_id, cert_id, score FROM posting_certs WHERE posting_id IN ({placeholders})"
+                " ORDER BY posting_id, score DESC",
+                list(posting_ids),
+            ).fetchall()
+        matches = {}
+        for row in rows:
+            matches.setdefault(row["posting_id"], []).append((row["cert_id"], row["score"]))
+        return matches
+
+    def _store_matches(self, postings): #Caller must hold self._lock inside a transaction; scores the whole batch at once
+        if self.matcher is None or not postings:
+            return
+        matches = self.matcher.top_matches([text for posting_id, text in postings])
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO posting_certs (posting_id, cert_id, score) VALUES (?, ?, ?)",
+            [(posting_id, cert_id, score) for (posting_id, text), posting_matches in zip(postings, matches)
+             for cert_id, score in posting_matches],
+        )
+
+    def _rematch_if_catalog_changed(self): #A new catalog version invalidates every stored match; redo them in one pass
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'match_catalog_version'").fetchone()
+            if row is not None and row["value"] == self.matcher.version:
+                return
+            postings = [(row["id"], f"{row['title']} {row['description']}")
+                        for row in self._conn.execute("SELECT id, title, description FROM postings")]
+            self._conn.execute("DELETE FROM posting_certs")
+            self._store_matches(postings)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('match_catalog_version', ?)", (self.matcher.version,)
+            )
+
+    def feed_title(self, feed_url):
+        with self._lock:
+            row = self._conn.execute("SELECT title FROM feeds WHERE url = ?", (feed_url,)).fetchone()
+        return row["title"] if row else None
+
+    def count(self, feed_url):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posting_feeds WHERE feed_url = ?", (feed_url,)).fetchone()[0]
+
+    def feed_page(self, feed_url, page=1, page_size=25): #One page of a feed's postings, newest first
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {POSTING_COLUMNS} FROM postings p JOIN posting_feeds f ON f.posting_id = p.id"
+                f" WHERE f.feed_url = ? {ORDER_BY_PUBLISHED} LIMIT ? OFFSET ?",
+                (feed_url, page_size, (page - 1) * page_size),
+            ).fetchall()
+
+    def search(self, text, limit=50): #Best full-text matches among postings still listed in some feed
+        query = _fts_query(text)
+        if not query:
+            return []
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {POSTING_COLUMNS} FROM postings_fts JOIN postings p ON p.id = postings_fts.rowid"
+                " WHERE postings_fts MATCH ? AND p.id IN (SELECT posting_id FROM posting_feeds)"
+                " ORDER BY bm25(postings_fts) LIMIT ?",
+                (query, limit),
+            ).fetchall()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store(): #One connection per process to the shared store file
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore(JOB_STORE_PATH, matcher=get_cert_matcher())
+        return _store
@@ -0,0 +1,89 @@
+import functools
+import re
+from collections import Counter
+import numpy as np
+import scipy.sparse as sp
+from catalog import catalog_version, certifications
+from search_index import tokenize
+
+TOP_K = 3
+MIN_MATCH_SCORE = 0.15  # genuine matches on sample postings scored 0.2 and up
+MIN_SHARED_TERMS = 2   # one shared word (e.g. "service") is too often a coincidence
+MATCHER_REVISION = 2   # bump when scoring changes, so stored matches are redone like after a catalog change
+TAG_PATTERN = re.compile(r"<[^>]+>")
+# Function words, and the vocabulary every job posting and certification blurb shares, carry no signal
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at based be been being both but by can could do does each
+etc for from has have he her his how i if in including into is it its may more most must new no not of on
+one only or other our out over own per she should so such than that the their them then there these they
+this those through to under up upon us use using very via was we well were what when where which while who
+will with within would you your
+ability apply career careers company duties experience job jobs knowledge level opportunity position
+preferred required requirements responsibilities role roles skills team work working year years
+""".split())
+
+
+def _l2_normalize(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.diags(1.0 / norms) @ matrix
+
+
+def _term_counter(text):
+    return Counter(term for term in tokenize(text) if len(term) > 1 and term not in STOPWORDS and not term.isdigit())
+
+
+class CertMatcher: #TF-IDF vectors of the certification catalog, for scoring job postings against it in batches
+    def __init__(self, catalog_certifications, version):
+        self.version = f"{version}:r{MATCHER_REVISION}"
+        self.cert_ids = list(catalog_certifications)
+        # Exam details are about test centres and accounts, not the subject, so they're left out
+        documents = [
+            " ".join([cert["name"], cert["certifying_organization"], cert["description"]])
+            for cert in catalog_certifications.values()
+        ]
+        counts = [_term_counter(document) for document in documents]
+        # Unsmoothed IDF: a term every certification shares can't tell them apart, so it's dropped outright
+        document_frequency = Counter(term for document_counts in counts for term in document_counts)
+        distinctive = sorted(term for term, df in document_frequency.items() if df < len(documents))
+        self.vocabulary = {term: i for i, term in enumerate(distinctive)}
+        self.idf = np.log(len(documents) / np.array([document_frequency[term] for term in distinctive], dtype=np.float64))
+        cert_matrix = self._term_counts(counts)
+        self.cert_matrix = _l2_normalize(cert_matrix @ sp.diags(self.idf)).T.tocsr()
+        self.cert_terms = (cert_matrix > 0).astype(np.float64).T.tocsr()
+
+    def _term_counts(self, counts): #Sparse (documents x vocabulary) term-count matrix; unknown terms are dropped
+        rows, columns, values = [], [], []
+        for row, document_counts in enumerate(counts):
+            for term, count in document_counts.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    values.append(count)
+        return sp.csr_matrix((values, (rows, columns)), shape=(len(counts), len(self.vocabulary)), dtype=np.float64)
+
+    def top_matches(self, texts, k=TOP_K, min_score=MIN_MATCH_SCORE): #[[(cert id, score)] per text], one matrix multiply for the batch
+        if not texts or not self.vocabulary:
+            return [[] for _ in texts]
+        counts = [_term_counter(TAG_PATTERN.sub(" ", text)) for text in texts]
+        posting_matrix = self._term_counts(counts)
+        scores = (_l2_normalize(posting_matrix @ sp.diags(self.idf)) @ self.cert_matrix).toarray()
+        shared_terms = ((posting_matrix > 0).astype(np.float64) @ self.cert_terms).toarray()
+        scores[shared_terms < MIN_SHARED_TERMS] = 0.0
+        k = min(k, len(self.cert_ids))
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        matches = []
+        for row, columns in enumerate(best):
+            ranked = sorted(columns, key=lambda column: scores[row, column], reverse=True)
+            matches.append([(self.cert_ids[column], float(scores[row, column])) for column in ranked if scores[row, column] >= min_score])
+        return matches
+
+
+@functools.lru_cache(maxsize=1)
+def _matcher_for_version(version):
+    return CertMatcher(certifications(), version)
+
+
+def get_cert_matcher(): #Built once per catalog version
+    return _matcher_for_version(catalog_version())
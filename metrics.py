@@ -0,0 +1,146 @@
+import collections
+import contextlib
+import functools
+import http.server
+import threading
+import time
+
+# Process-wide timings and counters for the hot paths (upstream fetches, feed parsing, rendering, caches).
+# Timings keep a rolling window of recent samples for percentiles plus running totals for Prometheus.
+
+DEFAULT_WINDOW = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+_lock = threading.Lock()
+_counters = collections.defaultdict(float)     # (name, labels) -> value
+_timings = {}                                   # (name, labels) -> {"window", "count", "sum"}
+_window = DEFAULT_WINDOW
+
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def set_window(size): #How many recent samples each timing keeps for percentiles, including timings already recorded
+    global _window
+    with _lock:
+        _window = size
+        for timing in _timings.values():
+            timing["window"] = collections.deque(timing["window"], maxlen=size)
+
+
+def inc(name, amount=1, **labels):
+    with _lock:
+        _counters[_key(name, labels)] += amount
+
+
+def observe(name, seconds, **labels):
+    key = _key(name, labels)
+    with _lock:
+        timing = _timings.get(key)
+        if timing is None:
+            timing = _timings[key] = {"window": collections.deque(maxlen=_window), "count": 0, "sum": 0.0}
+        timing["window"].append(seconds)
+        timing["count"] += 1
+        timing["sum"] += seconds
+
+
+@contextlib.contextmanager
+def span(stage, **labels): #Time a block as tc2_stage_seconds{stage=...}
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("tc2_stage_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+
+def timed(stage, **labels): #Decorator form of span()
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_upstream(upstream, status, size): #Status code and bytes transferred for one upstream response
+    inc("tc2_upstream_responses_total", upstream=upstream, status=status)
+    inc("tc2_upstream_bytes_total", size, upstream=upstream)
+
+
+def record_cache(cache, hit):
+    inc("tc2_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def snapshot(): #(counters, timings) as plain rows, for the admin page
+    with _lock:
+        counters = [{"name": name, **dict(labels), "value": value} for (name, labels), value in sorted(_counters.items())]
+        timings = []
+        for (name, labels), timing in sorted(_timings.items()):
+            ordered = sorted(timing["window"])
+            row = {"name": name, **dict(labels), "count": timing["count"]}
+            for q in QUANTILES:
+                row[f"p{int(q * 100)}"] = _percentile(ordered, q)
+            row["max"] = ordered[-1]
+            timings.append(row)
+    return counters, timings
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = ((key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value): #Full precision: "%g" rounds to 6 digits, which hides increments once a counter passes ~1e6
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def prometheus_text(): #Prometheus text exposition format: counters, and timings as summaries
+    lines = []
+    with _lock:
+        typed = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), timing in sorted(_timings.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            ordered = sorted(timing["window"])
+            for q in QUANTILES:
+                lines.append(f"{name}{_format_labels(labels + (('quantile', str(q)),))} {_percentile(ordered, q):.6f}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {timing['sum']:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {timing['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_server(port, host="0.0.0.0"): #Serve /metrics from a background thread
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
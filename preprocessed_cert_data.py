@@ -1,4 +1,5 @@
-# Add more lists of certifications recommended for a major here following the same structure
+# Add more lists of certifications recommended for a major here following the same structure,
+# then run `python build_catalog.py` to regenerate cert_catalog.json, which is what the app loads
     # "Major": {
         # "Another Certification Name": {
         #     "description": "...",
@@ -0,0 +1,167 @@
+import bisect
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from careeronestop import get_client
+from catalog import certifications
+from config import SEARCH_INDEX_MAX_API_DOCUMENTS
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+PREFIX_WEIGHT = 0.7     # "netw" -> "network"
+TYPO_WEIGHT = 0.5       # "netwrok" -> "network", "nerw" -> "network"
+MIN_TYPO_LENGTH = 4     # shorter tokens match too much when a typo is allowed
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def cert_list_doc_id(cert): #Index ID of a CareerOneStop CertList entry
+    return f"careeronestop:{cert.get('Id') or (cert.get('Name') or 'N/A') + '|' + (cert.get('Organization') or 'N/A')}"
+
+
+def _within_one_edit(a, b): #True if a and b differ by at most one insert, delete, substitution or transposition
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:] or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+    return a[i:] == b[i + 1:]
+
+
+class CertSearchIndex: #In-memory inverted index with BM25 ranking and typo-tolerant prefix matching
+    def __init__(self, k1=1.2, b=0.75, max_api_documents=None):
+        self.k1 = k1
+        self.b = b
+        self.max_api_documents = max_api_documents  # CareerOneStop results kept; the curated catalog is never evicted
+        self.documents = {}                 # doc_id -> display fields
+        self._postings = defaultdict(dict)  # term -> {doc_id: term frequency}
+        self._doc_terms = {}                # doc_id -> Counter of its terms, so documents can be replaced
+        self._doc_lengths = {}
+        self._total_length = 0
+        self._vocabulary = []               # sorted, for prefix lookups
+        self._api_documents = OrderedDict() # CareerOneStop doc_ids, least recently (re)added first
+        self._lock = threading.RLock()
+
+    def add(self, doc_id, document, text): #Index (or re-index) one document
+        terms = Counter(tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            self.documents[doc_id] = document
+            self._doc_terms[doc_id] = terms
+            self._doc_lengths[doc_id] = sum(terms.values())
+            self._total_length += self._doc_lengths[doc_id]
+            for term, frequency in terms.items():
+                if term not in self._postings:
+                    bisect.insort(self._vocabulary, term)
+                self._postings[term][doc_id] = frequency
+
+    def add_catalog(self, catalog_certifications): #Curated catalog table: {cert id: cert info}
+        for cert_id, cert_info in catalog_certifications.items():
+            document = {
+                "name": cert_info["name"],
+                "organization": cert_info["certifying_organization"],
+                "description": cert_info["description"],
+                "url": cert_info["more_info_url"] or cert_info["organization_url"],
+                "source": "catalog",
+            }
+            text = " ".join([cert_info["name"], cert_info["certifying_organization"], cert_info["description"], *cert_info["details"].values()])
+            self.add(f"catalog:{cert_id}", document, text)
+
+    def add_cert_list(self, cert_list): #CertList entries from a CareerOneStop certification finder response
+        for cert in cert_list:
+            name = cert.get("Name") or "N/A"
+            organization = cert.get("Organization") or "N/A"
+            document = {
+                "name": name,
+                "organization": organization,
+                "description": cert.get("Description", "N/A"),
+                "url": cert.get("Url"),
+                "source": "careeronestop",
+            }
+            doc_id = cert_list_doc_id(cert)
+            with self._lock:
+                self.add(doc_id, document, " ".join([name, organization, cert.get("Description") or ""]))
+                self._api_documents[doc_id] = None
+                self._api_documents.move_to_end(doc_id)
+                while self.max_api_documents is not None and len(self._api_documents) > self.max_api_documents:
+                    self._remove(self._api_documents.popitem(last=False)[0])
+
+    def search(self, query, limit=10): #[(doc_id, score, document)] best first
+        tokens = tokenize(query)
+        with self._lock:
+            if not tokens or not self.documents:
+                return []
+            average_length = self._total_length / len(self.documents)
+            scores = defaultdict(float)
+            for token in tokens:
+                # Each query token contributes its best-matching index term to each document
+                best = defaultdict(float)
+                for term, weight in self._expand(token):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (len(self.documents) - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, frequency in postings.items():
+                        length = self._doc_lengths[doc_id]
+                        tf = frequency * (self.k1 + 1) / (frequency + self.k1 * (1 - self.b + self.b * length / average_length))
+                        best[doc_id] = max(best[doc_id], weight * idf * tf)
+                for doc_id, score in best.items():
+                    scores[doc_id] += score
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [(doc_id, score, self.documents[doc_id]) for doc_id, score in ranked]
+
+    def _expand(self, token): #Index terms matching a query token, with how much to trust each match
+        matches = {}
+        start = bisect.bisect_left(self._vocabulary, token)
+        for term in self._vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            matches[term] = 1.0 if term == token else PREFIX_WEIGHT
+        if len(token) >= MIN_TYPO_LENGTH:
+            # Typos are only looked for among terms sharing the first letter, which keeps the scan small
+            start = bisect.bisect_left(self._vocabulary, token[0])
+            for term in self._vocabulary[start:]:
+                if term[0] != token[0]:
+                    break
+                if term in matches:
+                    continue
+                # A typo in what's typed so far can leave it a letter shorter or longer than the term's prefix
+                if any(_within_one_edit(token, candidate) for candidate in
+                       (term, term[:len(token)], term[:len(token) + 1], term[:len(token) - 1])):
+                    matches[term] = TYPO_WEIGHT
+        return matches.items()
+
+    def _remove(self, doc_id): #Caller must hold self._lock
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        del self.documents[doc_id]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(): #Built once per process from the curated catalog and every cached API response
+    global _index
+    with _index_lock:
+        if _index is None:
+            # Capped on its own: the response cache bounds pages, but each page holds many certifications
+            index = CertSearchIndex(max_api_documents=SEARCH_INDEX_MAX_API_DOCUMENTS)
+            index.add_catalog(certifications())
+            client = get_client()
+            for response in client.cache.values():
+                index.add_cert_list(response.get("CertList") or [])
+            client.add_listener(lambda keyword, response: index.add_cert_list(response.get("CertList") or []))
+            _index = index
+        return _index
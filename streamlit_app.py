@@ -1,165 +1,161 @@
 import streamlit as st
-import feedparser
-import datetime
-import requests
-import json
-import os
-from preprocessed_cert_data import certification_details
+import threading
+import admin_page
+import metrics
+from catalog import catalog_version
+from cert_panel import page_count, render_cert_list, render_major_panel
+from feed_cache import get_feed_cache
+from config import COS_PAGE_SIZE, FEED_CACHE_DIR, FEED_REFRESH_SECONDS, METRICS_PORT, METRICS_WINDOW, RSS_FEED_OPTIONS
+from job_panel import display_job_search, display_rss_feed, job_page_count
+from job_store import get_job_store
+from careeronestop import CareerOneStopError, record_count, search_certifications
+from search_index import cert_list_doc_id, get_search_index
+from warmup import warm_up_configured
 
 st.set_page_config(page_title="TC2 Hub - Toolkit", layout="wide")
 
-# Access the API key from Streamlit secrets
-CAREERONESTOP_API_KEY = st.secrets["COS_API_KEY"]
-CAREERONESTOP_USER_ID = st.secrets["COS_USER_ID"]
-BASE_URL = "https://api.careeronestop.org"
-
-RSS_FEED_OPTIONS = {
-    "Computer Engineering Technology 1": st.secrets["RSS_CET_1"],
-    "Mechanical Engineering Technology 1": st.secrets["RSS_MET_1"],
-    "Computer Engineering Technology 2": st.secrets["RSS_CET_2"],
-    "Mechanical Engineering Technology 2": st.secrets["RSS_MET_2"]
-}
-
-@st.cache_data(ttl=300)
-def fetch_careeronestop_data(api_url, headers=None, params=None):     #Function to query API for Certs
-    try:
-        response = requests.get(api_url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data from the API: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        st.error(f"Error decoding JSON response: {e}")
-        return None
-
-def display_rss_feed(rss_url): #Function to display RSS Feed
-    feed = feedparser.parse(rss_url)
-    feed_content = ""
-    if feed.get('bozo') == 1:
-        feed_content = f"<p style='color: red;'>Error fetching or parsing RSS feed: {feed.get('bozo_exception')}</p>"
-    else:
-        feed_content += f"<h3>{feed.get('feed', {}).get('title', 'RSS Feed')}</h3>"
-        for entry in feed.entries:
-            title = entry.get('title', 'No Title')
-            link = entry.get('link', '#')
-            description = entry.get('description', 'No Description')
-            published = entry.get('published')
-            published_parsed = entry.get('published_parsed')
-
-            entry_markdown = f"<strong><a href='{link}' target='_blank'>{title}</a></strong><br>"
-            if published_parsed:
-                published_date = datetime.datetime(*published_parsed[:6]).strftime("%Y-%m-%d %H:%M:%S")
-                entry_markdown += f"<small><em>{published_date}</em></small><br>"
-            elif published:
-                entry_markdown += f"<small><em>{published}</em></small><br>"
-            entry_markdown += f"<div style='margin-left: 10px;'>{description}</div><hr>"
-            feed_content += entry_markdown
-    return f'<div>{feed_content}</div>'
-
-st.title("TC2 Hub Toolkit")
-
-st.markdown("<div style='text-align: center;'><h2>Try some of our precurated searches...</h2></div>", unsafe_allow_html=True)
-selected_major = st.selectbox("What's your major", list(RSS_FEED_OPTIONS.keys()))
-
-col1, col2 = st.columns([0.65,0.35])
-with col1:
+feed_cache = get_feed_cache(refresh_interval=FEED_REFRESH_SECONDS, snapshot_dir=FEED_CACHE_DIR)
+job_store = get_job_store()
+
+@st.cache_resource
+def start_background_work(): #Runs once per process: feed new postings into the job store, prefetch in the background
+    feed_cache.add_listener(job_store.ingest)
+    metrics.set_window(METRICS_WINDOW)
+    if METRICS_PORT:
+        metrics.start_http_server(METRICS_PORT)
+    thread = threading.Thread(target=warm_up_configured, args=(feed_cache,), name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+start_background_work()
+
+if admin_page.requested():
+    admin_page.render_metrics_page(feed_cache)
+    st.stop()
+
+def page_selector(pages, key): #Page number input, shown only when there is more than one page
+    if pages <= 1:
+        return 1
+    return st.number_input("Page", min_value=1, max_value=pages, value=1, key=key)
+
+# Each column panel is a fragment: its own widgets rerun only that panel, not the whole page.
+# The major selectbox is the one input shared by two panels, so changing it reruns the page.
+@st.fragment
+@metrics.timed("panel_render", panel="recommended_certifications")
+def recommended_certifications_panel(major):
     st.subheader("Recommended Certifications")
     with st.container(height=750):
-        if selected_major:
-            certifications_for_major = certification_details[selected_major]
-
-            for cert_name, cert_info in certifications_for_major.items():
-                st.subheader(cert_name)
-                st.write(f"**Description:** {cert_info['description']}")
-                st.markdown(f"**Certifying Organization:** [{cert_info['certifying_organization']}]({cert_info['organization_url']})")
-
-                st.subheader("Certification Details")
-                for detail, value in cert_info['details'].items():
-                    st.write(f"- **{detail}**: {value}")
-
-                if cert_info['exam_details']:
-                    st.subheader("Exam Details")
-                    st.write(cert_info['exam_details'])
-
-                if cert_info['more_info_url']:
-                    st.subheader("More Information")
-                    st.markdown(f"[More on {cert_name}]({cert_info['more_info_url']})")
-
-                st.markdown("---")
+        if major:
+            # The whole page of certifications goes out as a single cached markdown element
+            page = page_selector(page_count(major), key=f"cert_page_{major}")
+            st.markdown(render_major_panel(major, catalog_version(), page))
         else:
             st.info("Please select a department to view its certifications.")
-with col2:
+
+@st.fragment
+@metrics.timed("panel_render", panel="related_jobs")
+def related_jobs_panel(major):
     st.subheader("Related Jobs")
     with st.container(height=750):
-        if selected_major:
-            rss_url = RSS_FEED_OPTIONS[selected_major]
-            rss_display = display_rss_feed(rss_url) 
+        if major:
+            rss_url = RSS_FEED_OPTIONS[major]
+            feed = feed_cache.get(rss_url)  # once per render; the first fetch also ingests it for the page count
+            page = page_selector(job_page_count(rss_url), key=f"related_jobs_page_{major}")
+            rss_display = display_rss_feed(rss_url, page, feed)
             st.markdown(rss_display, unsafe_allow_html=True)
-st.markdown("---")
-
-st.markdown("<div style='text-align: center;'><h2>or Do your own</h2></div>", unsafe_allow_html=True)
 
-col3, col4 = st.columns([0.65,0.35])
-with col3:
+def load_more_lookup_results():
+    st.session_state.lookup_pages += 1
+
+def careeronestop_results(keyword, local_results): #Pages render one at a time as they arrive; the client prefetches the one after
+    shown = {doc_id for doc_id, score, cert in local_results}
+    fetched = rendered = 0
+    pages = st.session_state.get("lookup_pages", 1)
+    for page in range(1, pages + 1):
+        try:
+            certification_data = search_certifications(keyword, page)
+        except CareerOneStopError as e:
+            st.error(str(e))
+            return
+        if not certification_data or "CertList" not in certification_data:
+            st.error("Failed to retrieve certification data or 'CertList' not found.")
+            return
+        fetched += len(certification_data["CertList"])
+        cert_list = [cert for cert in certification_data["CertList"] if cert_list_doc_id(cert) not in shown]
+        shown.update(cert_list_doc_id(cert) for cert in cert_list)
+        if cert_list:
+            if not rendered:
+                st.subheader("More from CareerOneStop:" if local_results else "Matching Certifications:")
+            rendered += len(cert_list)
+            st.markdown(render_cert_list(cert_list), unsafe_allow_html=True)
+    if not rendered and not local_results:
+        st.info("No certifications found matching your criteria.")
+    total = record_count(certification_data)
+    skipped = fetched - rendered
+    if total:
+        st.caption(f"Showing {rendered} of {total} CareerOneStop results"
+                   + (f" ({skipped} already listed above)" if skipped else ""))
+    if fetched < total and certification_data["CertList"]:
+        st.button("Load more", key="lookup_load_more", on_click=load_more_lookup_results)
+
+@st.fragment
+@metrics.timed("panel_render", panel="certification_lookup")
+def certification_lookup_panel():
     st.subheader("Certification Lookup")
-    keyword = st.text_input("Keyword:")
-    if st.button("Search Certifications"):
-        with st.container(height=750):
-            if keyword:
-                api_endpoint = f"{BASE_URL}/v1/certificationfinder/{CAREERONESTOP_USER_ID}/{keyword}/0/0/0/0/0/0/0/0/0/20"
-                headers = {
-                    "Authorization": f"Bearer {CAREERONESTOP_API_KEY}",
-                    "Accept": "application/json"
-                }
-                certification_data = fetch_careeronestop_data(api_endpoint, headers=headers)
-                if certification_data and "CertList" in certification_data:
-                    cert_list = certification_data["CertList"]
-                    if cert_list:
-                        st.subheader("Matching Certifications:")
-                        for cert in cert_list:
-                            st.write(f"**{cert.get('Name', 'N/A')}**")
-                            badges_markdown = ""
-                            agency_list = cert.get("CertAccredAgencyList")
-                            if agency_list:
-                                for agency in agency_list:
-                                    agency_name = agency.get("Name", "").upper()
-                                    if agency_name == "IN-DEMAND":
-                                        badges_markdown += f':red-badge[In-Demand] '
-                                    elif agency_name == "MILITARY":
-                                        badges_markdown += f':green-badge[Military] '
-                                    elif agency_name == "ANSI":
-                                        badges_markdown += f':blue-badge[ANSI] '
-                                    elif agency_name == "JOB CORPS":
-                                        badges_markdown += f':violet-badge[Job Corps] '
-                                    elif agency_name == "NCCA":
-                                        badges_markdown += f':violet-badge[NCCA] '
-                                    elif agency_name == "NAM":
-                                        badges_markdown += f':violet-badge[NAM] '
-                                    elif agency_name == "ABNS":
-                                        badges_markdown += f':violet-badge[ABNS] '
-                                    elif agency_name == "ICAC":
-                                        badges_markdown += f':violet-badge[ICAC] '
-                            if badges_markdown:
-                                st.markdown(f"{badges_markdown}", unsafe_allow_html=True)
-                            st.write(f"Organization: {cert.get('Organization', 'N/A')}")
-                            st.write(f"Description: {cert.get('Description', 'N/A')}")
-                            if "Url" in cert and cert["Url"]:
-                                st.markdown(f"[More Info]({cert['Url']})")
-                            st.markdown("---")
-                    else:
-                        st.info("No certifications found matching your criteria.")
-                else:
-                    st.error("Failed to retrieve certification data or 'CertList' not found.")
-            else:
+    keyword = st.text_input("Keyword:", key="lookup_keyword")
+    search_clicked = st.button("Search Certifications")
+    with st.container(height=750):
+        # Local matches from the curated catalog and past API results show instantly; the API only enriches them
+        local_results = get_search_index().search(keyword) if keyword else []
+        if local_results:
+            st.subheader("Quick Matches:")
+            for doc_id, score, cert in local_results:
+                st.write(f"**{cert['name']}**")
+                st.write(f"Organization: {cert['organization']}")
+                st.write(f"Description: {cert['description']}")
+                if cert["url"]:
+                    st.markdown(f"[More Info]({cert['url']})")
+                st.markdown("---")
+        if search_clicked:
+            st.session_state.lookup_searched = keyword
+            st.session_state.lookup_pages = 1
+            if not keyword:
                 st.warning("Please enter a keyword to search for certifications.")
+        if keyword and st.session_state.get("lookup_searched") == keyword:
+            careeronestop_results(keyword, local_results)
 
-with col4:
+@st.fragment
+@metrics.timed("panel_render", panel="job_postings")
+def job_postings_panel():
     st.subheader("Job Postings (Handshake)")
-    selected_feed = st.selectbox("Select a feed:", list(RSS_FEED_OPTIONS.keys()))
+    selected_feed = st.selectbox("Select a feed:", list(RSS_FEED_OPTIONS.keys()), key="job_postings_feed")
+    job_query = st.text_input("Search all job postings:", key="job_search")
     with st.container(height=750):
-        if selected_feed:
+        if job_query:
+            st.markdown(display_job_search(job_query), unsafe_allow_html=True)
+        elif selected_feed:
             rss_url = RSS_FEED_OPTIONS[selected_feed]
-            rss_display = display_rss_feed(rss_url) # This function returns the content wrapped in <div class="scrollable-block">
+            feed = feed_cache.get(rss_url)
+            page = page_selector(job_page_count(rss_url), key=f"job_postings_page_{selected_feed}")
+            rss_display = display_rss_feed(rss_url, page, feed)
             st.markdown(rss_display, unsafe_allow_html=True)
+
+st.title("TC2 Hub Toolkit")
+
+st.markdown("<div style='text-align: center;'><h2>Try some of our precurated searches...</h2></div>", unsafe_allow_html=True)
+selected_major = st.selectbox("What's your major", list(RSS_FEED_OPTIONS.keys()), key="selected_major")
+
+col1, col2 = st.columns([0.65,0.35])
+with col1:
+    recommended_certifications_panel(selected_major)
+with col2:
+    related_jobs_panel(selected_major)
+st.markdown("---")
+
+st.markdown("<div style='text-align: center;'><h2>or Do your own</h2></div>", unsafe_allow_html=True)
+
+col3, col4 = st.columns([0.65,0.35])
+with col3:
+    certification_lookup_panel()
+with col4:
+    job_postings_panel()
@@ -0,0 +1,27 @@
+import json
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# config.py reads .streamlit/secrets.toml from the working directory when first imported, so the tests
+# run from a scratch directory with placeholder secrets and nothing pointing at real upstreams
+WORKDIR = tempfile.mkdtemp(prefix="tc2-tests-")
+os.makedirs(os.path.join(WORKDIR, ".streamlit"))
+with open(os.path.join(WORKDIR, ".streamlit", "secrets.toml"), "w") as f:
+    for key, value in {
+        "COS_API_KEY": "test",
+        "COS_USER_ID": "test",
+        "RSS_CET_1": "http://127.0.0.1:9/cet1",
+        "RSS_MET_1": "http://127.0.0.1:9/met1",
+        "RSS_CET_2": "http://127.0.0.1:9/cet2",
+        "RSS_MET_2": "http://127.0.0.1:9/met2",
+        "FEED_CACHE_DIR": os.path.join(WORKDIR, "feeds"),
+        "JOB_STORE_PATH": os.path.join(WORKDIR, "jobs.sqlite3"),
+        "COS_CACHE_PATH": os.path.join(WORKDIR, "careeronestop.sqlite3"),
+        "WARMUP_KEYWORDS": [],
+    }.items():
+        f.write(f"{key} = {json.dumps(value)}\n")
+os.chdir(WORKDIR)
@@ -0,0 +1,31 @@
+import json
+from build_catalog import build_catalog, serialize
+from catalog import CATALOG_PATH
+from preprocessed_cert_data import certification_details
+
+
+def test_details_keep_source_order():
+    catalog = json.loads(serialize(build_catalog(certification_details)))
+    for major, certs in certification_details.items():
+        for name, cert_id in catalog["majors"][major]:
+            assert list(catalog["certifications"][cert_id]["details"]) == list(certs[name]["details"])
+
+
+def test_majors_keep_source_order():
+    catalog = build_catalog(certification_details)
+    assert list(catalog["majors"]) == list(certification_details)
+    for major, certs in certification_details.items():
+        assert [name for name, cert_id in catalog["majors"][major]] == list(certs)
+
+
+def test_shipped_catalog_is_up_to_date():
+    with open(CATALOG_PATH, encoding="utf-8") as f:
+        assert f.read() == serialize(build_catalog(certification_details))
+
+
+def test_same_certification_under_two_names_is_stored_once():
+    ccna = certification_details["Computer Engineering Technology 2"]["CCNA Certification"]
+    details = {"Major A": {"CCNA Certification": ccna}, "Major B": {"CCNA Certification CET1": dict(ccna)}}
+    catalog = build_catalog(details)
+    assert list(catalog["certifications"]) == ["ccna-certification"]
+    assert catalog["majors"]["Major B"] == [["CCNA Certification CET1", "ccna-certification"]]
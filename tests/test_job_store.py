@@ -0,0 +1,90 @@
+import pytest
+from job_store import JobStore
+
+
+def entry(number, guid=True, link=True, title=None):
+    posting = {"title": title or f"Welder {number}", "description": f"Posting {number}"}
+    if guid:
+        posting["id"] = f"guid-{number}"
+    if link:
+        posting["link"] = f"https://jobs.example.edu/{number}"
+    return posting
+
+
+def feed(*entries, title="Feed"):
+    return {"feed": {"title": title}, "entries": list(entries)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def titles(rows):
+    return sorted(row["title"] for row in rows)
+
+
+def test_ingest_counts_only_new_postings(store):
+    assert store.ingest("F", feed(entry(1), entry(2))) == 2
+    assert store.ingest("F", feed(entry(1), entry(2), entry(3))) == 1
+    assert store.count("F") == 3
+    assert store.feed_title("F") == "Feed"
+
+
+def test_same_posting_in_two_feeds_is_stored_once(store):
+    store.ingest("F", feed(entry(1)))
+    assert store.ingest("G", feed(entry(1))) == 0
+    assert store.count("F") == store.count("G") == 1
+    assert len(store.search("welder")) == 1
+
+
+def test_dedup_by_link_when_guid_is_missing(store):
+    store.ingest("F", feed(entry(1)))
+    assert store.ingest("G", feed(entry(1, guid=False))) == 0
+    assert store.count("G") == 1
+
+
+def test_dedup_by_guid_when_link_changes(store):
+    store.ingest("F", feed(entry(1)))
+    moved = dict(entry(1), link="https://jobs.example.edu/moved")
+    assert store.ingest("F", feed(moved)) == 0
+
+
+def test_entries_without_guid_or_link_are_skipped(store):
+    assert store.ingest("F", feed(entry(1, guid=False, link=False))) == 0
+    assert store.count("F") == 0
+
+
+def test_postings_dropped_from_a_feed_are_no_longer_listed(store):
+    store.ingest("F", feed(entry(1), entry(2), entry(3)))
+    store.ingest("F", feed(entry(4)))
+    assert store.count("F") == 1
+    assert titles(store.feed_page("F")) == ["Welder 4"]
+    assert titles(store.search("welder")) == ["Welder 4"]
+
+
+def test_posting_stays_listed_in_feeds_that_still_carry_it(store):
+    store.ingest("F", feed(entry(1), entry(2)))
+    store.ingest("G", feed(entry(1)))
+    store.ingest("F", feed(entry(2)))
+    assert titles(store.feed_page("G")) == ["Welder 1"]
+    assert titles(store.search("welder")) == ["Welder 1", "Welder 2"]
+
+
+def test_empty_feed_keeps_what_the_store_had(store):
+    store.ingest("F", feed(entry(1), entry(2)))
+    store.ingest("F", feed())
+    assert store.count("F") == 2
+
+
+def test_feed_page_is_newest_first_and_paged(store):
+    entries = [dict(entry(number), published_parsed=(2024, 1, number, 0, 0, 0, 0, 0, 0)) for number in range(1, 6)]
+    store.ingest("F", feed(*entries))
+    assert [row["title"] for row in store.feed_page("F", page=1, page_size=2)] == ["Welder 5", "Welder 4"]
+    assert [row["title"] for row in store.feed_page("F", page=3, page_size=2)] == ["Welder 1"]
+
+
+def test_search_matches_word_prefixes(store):
+    store.ingest("F", feed(entry(1, title="Network Technician"), entry(2, title="Barista")))
+    assert titles(store.search("netw tech")) == ["Network Technician"]
+    assert store.search("") == []
@@ -0,0 +1,51 @@
+import pytest
+from matching import CertMatcher
+
+
+def cert(name, organization, description):
+    return {"name": name, "certifying_organization": organization, "description": description,
+            "exam_details": "Online exam at a Pearson VUE test center; first-time takers create a web account."}
+
+
+@pytest.fixture
+def matcher():
+    return CertMatcher({
+        "ccna": cert("CCNA Certification", "Cisco Systems", "Configure and troubleshoot routers, switches and networking for IT roles."),
+        "a-plus": cert("CompTIA A+ Certification", "CompTIA", "Computer hardware installation, diagnosing and preventive maintenance for IT roles."),
+        "welding": cert("Certified Welder", "American Welding Society", "Structural steel welding and inspection for IT roles."),
+    }, "v1")
+
+
+def matched(matcher, text):
+    return [cert_id for cert_id, score in matcher.top_matches([text])[0]]
+
+
+def test_relevant_postings_match_their_certification(matcher):
+    assert matched(matcher, "Network intern: configure Cisco routers and switches.") == ["ccna"]
+    assert matched(matcher, "Help desk: install computer hardware, perform preventive maintenance.") == ["a-plus"]
+
+
+def test_filler_words_do_not_match(matcher):
+    assert matched(matcher, "Barista at the coffee shop, serving customers and keeping it clean for the team.") == []
+
+
+def test_terms_every_certification_shares_carry_no_weight(matcher):
+    assert "it" not in matcher.vocabulary and "roles" not in matcher.vocabulary
+    assert matched(matcher, "IT roles for IT people in IT") == []
+
+
+def test_one_shared_term_is_not_enough(matcher):
+    assert matched(matcher, "Lifeguard with a steel whistle.") == []
+
+
+def test_exam_logistics_are_not_matched(matcher):
+    assert matched(matcher, "Tutor at the online learning center; create a web account first.") == []
+
+
+def test_batch_keeps_order_and_html_is_ignored(matcher):
+    results = matcher.top_matches(["<p>Structural <b>welding</b> inspection</p>", "Coffee shop", ""])
+    assert [[cert_id for cert_id, score in matches] for matches in results] == [["welding"], [], []]
+
+
+def test_version_changes_with_the_catalog(matcher):
+    assert matcher.version.startswith("v1:")
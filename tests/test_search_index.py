@@ -0,0 +1,75 @@
+import pytest
+from search_index import CertSearchIndex, _within_one_edit
+
+
+@pytest.mark.parametrize("a, b", [
+    ("network", "network"),
+    ("netwrk", "network"),      # deletion
+    ("netwoork", "network"),    # insertion
+    ("netwerk", "network"),     # substitution
+    ("ntework", "network"),     # transposition
+    ("networ", "network"),
+])
+def test_within_one_edit(a, b):
+    assert _within_one_edit(a, b)
+    assert _within_one_edit(b, a)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("ntwrk", "network"),
+    ("netwkro", "network"),
+    ("welding", "network"),
+    ("abc", "abcde"),
+])
+def test_not_within_one_edit(a, b):
+    assert not _within_one_edit(a, b)
+
+
+@pytest.fixture
+def index():
+    index = CertSearchIndex()
+    index.add("ccna", {"name": "CCNA"}, "CCNA networking fundamentals from Cisco")
+    index.add("welding", {"name": "Certified Welder"}, "Structural welding inspection")
+    return index
+
+
+def expanded(index, token):
+    return dict(index._expand(token))
+
+
+def test_expand_exact_term_has_full_weight(index):
+    assert expanded(index, "cisco")["cisco"] == 1.0
+
+
+def test_expand_prefix(index):
+    assert "networking" in expanded(index, "netw")
+
+
+@pytest.mark.parametrize("token", ["netwrk", "netwoork", "netwirking", "ciscp"])
+def test_expand_typo_in_prefix_or_word(index, token):
+    assert expanded(index, token)
+
+
+def test_expand_short_tokens_get_no_typo_matches(index):
+    assert expanded(index, "cix") == {}
+
+
+def test_search_ranks_the_matching_document(index):
+    assert [doc_id for doc_id, score, document in index.search("netwrk")] == ["ccna"]
+    assert [doc_id for doc_id, score, document in index.search("weld insp")] == ["welding"]
+    assert index.search("") == []
+
+
+def test_readding_a_document_replaces_it(index):
+    index.add("welding", {"name": "Certified Welder"}, "Pipe fitting")
+    assert index.search("inspection") == []
+    assert [doc_id for doc_id, score, document in index.search("pipe")] == ["welding"]
+
+
+def test_careeronestop_results_are_capped_oldest_first():
+    index = CertSearchIndex(max_api_documents=2)
+    index.add("catalog:ccna", {"name": "CCNA"}, "CCNA networking")
+    index.add_cert_list([{"Id": str(number), "Name": "Cert", "Description": topic} for number, topic in enumerate(["hvac", "plumbing", "robotics"])])
+    assert sorted(index.documents) == ["careeronestop:1", "careeronestop:2", "catalog:ccna"]
+    assert index.search("hvac") == []
+    assert "hvac" not in index._vocabulary
@@ -0,0 +1,61 @@
+import argparse
+import concurrent.futures
+import threading
+import time
+from feed_cache import FeedCache
+from job_store import get_job_store
+from careeronestop import search_certifications
+from config import FEED_CACHE_DIR, RSS_FEED_OPTIONS, WARMUP_KEYWORDS, WARMUP_TIMEOUT_SECONDS
+
+def _start_daemon(fn, *args): #Future for fn(*args) on a daemon thread, so a hung upstream can't keep the process alive
+    future = concurrent.futures.Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="warm-up-task", daemon=True).start()
+    return future
+
+def warm_up(feed_cache, feed_urls, keywords, timeout=WARMUP_TIMEOUT_SECONDS): #Fetch every feed and the first page of common searches concurrently
+    tasks = {}
+    for url in feed_urls:
+        tasks[_start_daemon(feed_cache.refresh, url)] = f"feed {url}"
+    for keyword in keywords:
+        tasks[_start_daemon(search_certifications, keyword, 1, False)] = f"search {keyword!r}"
+
+    # Stragglers past the timeout keep going in the background, but never hold up the caller or exit
+    results = {name: "timeout" for name in tasks.values()}
+    done, _ = concurrent.futures.wait(tasks, timeout=timeout)
+    for future in done:
+        try:
+            results[tasks[future]] = "ok" if _succeeded(future.result()) else "error"
+        except Exception as e:
+            results[tasks[future]] = f"error: {e}"
+    return results
+
+def _succeeded(result): #Feeds come back as FeedParserDicts, searches as JSON dicts
+    return not (result.get("bozo") == 1 and not result.get("entries"))
+
+def warm_up_configured(feed_cache): #Warm every configured feed and WARMUP_KEYWORDS search
+    return warm_up(feed_cache, list(RSS_FEED_OPTIONS.values()), WARMUP_KEYWORDS)
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch the job feeds and common certification searches.")
+    parser.add_argument("--keyword", action="append", help="keyword search to warm (repeatable, defaults to WARMUP_KEYWORDS)")
+    parser.add_argument("--timeout", type=float, default=WARMUP_TIMEOUT_SECONDS, help="seconds to wait for the whole warm-up")
+    args = parser.parse_args()
+
+    feed_cache = FeedCache(snapshot_dir=FEED_CACHE_DIR)
+    feed_cache.add_listener(get_job_store().ingest)
+    start = time.perf_counter()
+    results = warm_up(feed_cache, list(RSS_FEED_OPTIONS.values()), args.keyword or WARMUP_KEYWORDS, timeout=args.timeout)
+    for name, status in results.items():
+        print(f"{status:>8}  {name}")
+    print(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+    return 0 if all(status == "ok" for status in results.values()) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())